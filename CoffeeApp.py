@@ -1,14 +1,27 @@
+import base64
+import bisect
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from PIL import Image
+
+# numba is optional: it only pays off once the trend holds real per-minute
+# shift data. Without it the kernel runs as plain Python; results are identical.
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]        # bare @njit
+        return lambda func: func  # @njit(...)
 
 # --- 1. CONFIGURATION & BRANDING ---
 st.set_page_config(page_title="Candour Coffee | Executive Dashboard", layout="wide")
 
-# Custom CSS for a "Premium Craft" look
-st.markdown("""
+# Custom CSS for a "Premium Craft" look, plus the alert-box overrides.
+# Kept as one static block so main() emits a single markdown call.
+_STATIC_CSS = """
     <style>
     .main { background-color: #f8f9fa; }
     .stMetric { 
@@ -19,8 +32,29 @@ st.markdown("""
         border: 1px solid #eee;
     }
     h1, h2, h3 { color: #3d2b1f; }
+
+    /* This forces the container box to be SOLID WHITE */
+    [data-testid="stNotification"] {
+        background-color: #FFFFFF !important;
+        opacity: 1 !important;
+        border: 2px solid #3d2b1f !important;
+        box-shadow: 0 4px 10px rgba(0,0,0,0.3) !important;
+    }
+
+    /* This removes the 'transy' green/red background inside the box */
+    [data-testid="stNotification"] > div {
+        background-color: transparent !important;
+        opacity: 1 !important;
+    }
+
+    /* This makes your text (Inventory Level: Healthy) Pitch Black and Extra Bold */
+    [data-testid="stNotification"] p {
+        color: #000000 !important;
+        font-weight: 900 !important;
+        opacity: 1 !important;
+    }
     </style>
-    """, unsafe_allow_html=True)
+    """
 
 
 # --- 2. OPERATIONAL DATA MODELS (Direct from Report) ---
@@ -35,26 +69,46 @@ OPTIMIZED_CT = 29.0       # U-Shaped Layout
 AUTOMATED_CT = 12.0       # Semi-Automation Goal
 SHIFT_SEC = 7 * 3600      # 7-hour effective shift [cite: 183]
 
+# Live cycle-time slider range (sec)
+CYCLE_MIN, CYCLE_MAX = 10, 50
+
+# Traffic Light thresholds (yellow, red)
+_CYCLE_TH = (35, 40)
+_DEFECT_TH = (2.0, 3.0)
+
+# Fatigue Detection
+FATIGUE_WINDOW = 3        # Samples in the rolling cycle-time mean
+FATIGUE_RUN = 2           # Consecutive samples at/above WARNING that flag fatigue
+
+# Gallery photos: downscaled WebP copies written by optimize_images.py
+GALLERY_FILES = tuple(f"{i}.webp" for i in range(1, 9))
+
+# Plotly client config: the trend chart keeps hover, the capacity chart is static
+_TREND_CONFIG = {"displayModeBar": False, "scrollZoom": False}
+_CAP_CONFIG = {"staticPlot": True, "displayModeBar": False}
+
 # --- 3. HELPER FUNCTIONS ---
-def get_kpi_color(value, red, yellow):
-    """Implementation of Traffic Light System """
-    if value >= red: return "🔴 CRITICAL", "error"
-    if value >= yellow: return "🟡 WARNING", "warning"
-    return "🟢 OPTIMAL", "success"
+_LEVELS = (("🟢 OPTIMAL", "success"), ("🟡 WARNING", "warning"), ("🔴 CRITICAL", "error"))
 
-import base64
+def get_kpi_color(value, thresholds):
+    """Implementation of Traffic Light System; thresholds are (yellow, red), both inclusive"""
+    return _LEVELS[bisect.bisect_right(thresholds, value)]
 
-def main():
-# --- BACKGROUND IMAGE LOGIC ---
-    def get_base64(bin_file):
-        with open(bin_file, 'rb') as f:
-            data = f.read()
-        return base64.b64encode(data).decode()
+@st.cache_resource(show_spinner=False)
+def load_asset(path):
+    """Raw bytes of a static file, read from disk once per process
 
-    try:
-        # This looks for your Background.jpeg file
-        bin_str = get_base64('Background.jpeg')
-        st.markdown(f"""
+    Raises OSError if the file is missing. Streamlit does not cache the
+    failure, so the next rerun tries again once the file is in place.
+    """
+    with open(path, 'rb') as f:
+        return f.read()
+
+@st.cache_data(show_spinner=False)
+def build_bg_css():
+    """Background-image <style> block, built once and reused on every rerun"""
+    bin_str = base64.b64encode(load_asset("Background.jpeg")).decode()
+    return f"""
     <style>
     .stApp {{
         background-image: url("data:image/jpeg;base64,{bin_str}");
@@ -79,58 +133,81 @@ def main():
     }}
     
     </style>
-    """, unsafe_allow_html=True)
-    except Exception as e:
-        st.error("Background image not found. Ensure 'Background.jpeg' is in the folder.")
+    """
 
-    # --- SIDEBAR: LOGO & INPUTS ---
-    try:
-        st.sidebar.image("logo.png", use_container_width=True)
-    except:
-        st.sidebar.title("☕ Candour Coffee")
-    
-    st.sidebar.markdown("---")
-    st.sidebar.header("🕹️ Live Operations Input")
-    st.sidebar.info("Update these values based on real-time floor data to bridge the 'Visibility Gap.")
-    
-    curr_stock = st.sidebar.number_input("Current Stock (kg)", value=45)
-    curr_cycle = st.sidebar.slider("Current Cycle Time (sec)", 10, 50, 29)
-    curr_defect = st.sidebar.slider("Defect Rate (%)", 0.0, 5.0, 1.2)
+@st.cache_data(show_spinner=False)
+def build_page_css():
+    """Full page stylesheet: background block followed by the static rules"""
+    return build_bg_css() + _STATIC_CSS
 
-    # --- HEADER ---
-    st.title("🚀 Operational Nervous System: Vikhroli Facility")
+@st.cache_data(show_spinner=False)
+def build_gallery_html(paths):
+    """Gallery as one flex row of <img> tags with the WebP bytes inlined as data URIs"""
+    tags = ''.join(
+        f'<img src="data:image/webp;base64,{base64.b64encode(load_asset(p)).decode()}" '
+        'style="flex:1 1 0;min-width:0;height:300px;object-fit:cover;border-radius:10px">'
+        for p in paths
+    )
+    return f'<div style="display:flex;gap:10px">{tags}</div>'
 
-    st.markdown("""
-        <style>
-        /* This forces the container box to be SOLID WHITE */
-        [data-testid="stNotification"] {
-            background-color: #FFFFFF !important;
-            opacity: 1 !important;
-            border: 2px solid #3d2b1f !important;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.3) !important;
-        }
-
-        /* This removes the 'transy' green/red background inside the box */
-        [data-testid="stNotification"] > div {
-            background-color: transparent !important;
-            opacity: 1 !important;
-        }
-
-        /* This makes your text (Inventory Level: Healthy) Pitch Black and Extra Bold */
-        [data-testid="stNotification"] p {
-            color: #000000 !important;
-            font-weight: 900 !important;
-            opacity: 1 !important;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    st.markdown(f"**Focus: Efficiency & Excellence*")
-    
-    # st.image("roastery.jpg", caption="Candour Coffee Roastery Operations", use_container_width=True)
-    
-    st.markdown("---")
+@njit(cache=True)
+def compute_trend(samples, window, limit, run_len):
+    """Rolling-mean cycle time and fatigue mask (samples >= limit for run_len in a row)"""
+    n = samples.shape[0]
+    smooth = np.empty(n)
+    fatigue = np.zeros(n, dtype=np.bool_)
+    total = 0.0
+    run = 0
+    for i in range(n):
+        total += samples[i]
+        if i >= window:
+            total -= samples[i - window]
+        smooth[i] = total / min(i + 1, window)
+        run = run + 1 if samples[i] >= limit else 0
+        fatigue[i] = run >= run_len
+    return smooth, fatigue
+
+@st.cache_data(show_spinner=False)
+def make_trend_fig(curr_cycle):
+    """Shift cycle-time line chart, memoized per live cycle-time value"""
+    # Data simulating the afternoon fatigue mentioned in the report
+    trend_data = pd.DataFrame({
+        'Hour': ['9AM', '10AM', '11AM', '12PM', '2PM', '3PM', '4PM'],
+        'Cycle Time (s)': [30, 29, 29, 31, 35, 38, curr_cycle]
+    })
+
+    fig_trend = px.line(trend_data, x='Hour', y='Cycle Time (s)', 
+                        title="Shift Cycle Time: Detecting Worker Fatigue", 
+                        markers=True, color_discrete_sequence=['#3d2b1f'])
+    fig_trend.add_hline(y=40, line_dash="dash", line_color="red", annotation_text="Critical Limit")
+
+    hours = trend_data['Hour'].to_numpy()
+    samples = trend_data['Cycle Time (s)'].to_numpy(dtype=np.float64)
+    smooth, fatigue = compute_trend(samples, FATIGUE_WINDOW, float(_CYCLE_TH[0]), FATIGUE_RUN)
+    fig_trend.add_trace(go.Scatter(x=hours, y=smooth, mode='lines', name='Rolling Avg',
+                                   line=dict(color='#a67b5b', dash='dot')))
+    fig_trend.add_trace(go.Scatter(x=hours[fatigue], y=samples[fatigue], mode='markers',
+                                   name='Fatigue', marker=dict(color='red', size=12, symbol='x')))
+    fig_trend.update_layout(uirevision="fixed")
+    return fig_trend
+
+@st.cache_resource(show_spinner=False)
+def make_cap_fig():
+    """Capacity bar chart; its inputs are constants so it is built once per process"""
+    sim_data = pd.DataFrame({
+        'Stage': ['Manual (Baseline)', 'U-Layout (Optimized)', 'Semi-Automation'],
+        'Daily Capacity': [SHIFT_SEC/BASELINE_CT, SHIFT_SEC/OPTIMIZED_CT, SHIFT_SEC/AUTOMATED_CT]
+    })
 
-    # --- SECTION 1: INVENTORY INTELLIGENCE ---
+    fig_cap = px.bar(sim_data, x='Stage', y='Daily Capacity', color='Stage', 
+                     text_auto='.0f', title="Capacity Growth Modeling (Units per 7-Hr Shift)")
+    fig_cap.update_layout(uirevision="fixed")
+    return fig_cap
+
+# --- 4. DASHBOARD SECTIONS ---
+
+def inventory_section(curr_stock):
+    """SECTION 1: INVENTORY INTELLIGENCE"""
     st.header("1. Inventory Strategy & Liquidity")
     i_col1, i_col2, i_col3 = st.columns(3)
     
@@ -149,18 +226,19 @@ def main():
         st.metric("Safety Stock", f"{SAFETY_STOCK} kg")
         st.caption("5-day buffer for Mumbai logistics.")
 
-    # --- SECTION 2: PRODUCTION KPIs (Traffic Lights) ---
+def kpi_section(curr_cycle, curr_defect):
+    """SECTION 2: PRODUCTION KPIs (Traffic Lights)"""
     st.markdown("---")
     st.header("2. Real-Time Production Visibility")
     p_col1, p_col2, p_col3 = st.columns(3)
 
     with p_col1:
-        status, level = get_kpi_color(curr_cycle, 40, 35)
+        status, level = get_kpi_color(curr_cycle, _CYCLE_TH)
         st.metric("Cycle Time", f"{curr_cycle}s", delta=f"{curr_cycle - BASELINE_CT}s")
         getattr(st, level)(f"Status: {status}")
 
     with p_col2:
-        status, level = get_kpi_color(curr_defect, 3.0, 2.0)
+        status, level = get_kpi_color(curr_defect, _DEFECT_TH)
         st.metric("Defect Rate", f"{curr_defect}%")
         getattr(st, level)(f"Status: {status}")
 
@@ -169,88 +247,81 @@ def main():
         st.metric("Hourly Throughput", f"{hourly_output} Units")
         st.caption("Current productivity ceiling.")
 
-    # --- SECTION 3: TREND ANALYSIS (Fatigue Detection) ---
+def trend_section(curr_cycle):
+    """SECTION 3: TREND ANALYSIS (Fatigue Detection)"""
     st.markdown("---")
     st.header("3. Productivity Trend Analysis")
     
-    # Data simulating the afternoon fatigue mentioned in the report
-    trend_data = pd.DataFrame({
-        'Hour': ['9AM', '10AM', '11AM', '12PM', '2PM', '3PM', '4PM'],
-        'Cycle Time (s)': [30, 29, 29, 31, 35, 38, curr_cycle]
-    })
-    
-    fig_trend = px.line(trend_data, x='Hour', y='Cycle Time (s)', 
-                        title="Shift Cycle Time: Detecting Worker Fatigue", 
-                        markers=True, color_discrete_sequence=['#3d2b1f'])
-    fig_trend.add_hline(y=40, line_dash="dash", line_color="red", annotation_text="Critical Limit")
-    st.plotly_chart(fig_trend, use_container_width=True)
+    fig_trend = make_trend_fig(curr_cycle)
+    st.plotly_chart(fig_trend, use_container_width=True, config=_TREND_CONFIG)
 
-    # --- SECTION 4: SCALABILITY SIMULATOR ---
+def capacity_section():
+    """SECTION 4: SCALABILITY SIMULATOR"""
     st.markdown("---")
     st.header("4. Scalability & Investment Simulation")
     
-    sim_data = pd.DataFrame({
-        'Stage': ['Manual (Baseline)', 'U-Layout (Optimized)', 'Semi-Automation'],
-        'Daily Capacity': [SHIFT_SEC/BASELINE_CT, SHIFT_SEC/OPTIMIZED_CT, SHIFT_SEC/AUTOMATED_CT]
-    })
-    
-    fig_cap = px.bar(sim_data, x='Stage', y='Daily Capacity', color='Stage', 
-                     text_auto='.0f', title="Capacity Growth Modeling (Units per 7-Hr Shift)")
-    st.plotly_chart(fig_cap, use_container_width=True)
+    fig_cap = make_cap_fig()
+    st.plotly_chart(fig_cap, use_container_width=True, config=_CAP_CONFIG)
     
     st.info("💡 **Recommendation:** Trigger Level 2 Automation when daily demand exceeds 600 units.")
-    
-# --- SECTION 5: FACILITY VISUALS ---
+
+def gallery_section():
+    """SECTION 5: FACILITY VISUALS"""
     st.markdown("---")
     st.header("5. Vikhroli Facility Gallery")
     
-    st.markdown("""
-        <style>
-        [data-testid="stImage"] img {
-            height: 300px;
-            object-fit: cover;
-            border-radius: 10px;
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    
-    st.markdown("""
-        <style>
-        [data-testid="stSidebar"] [data-testid="stImage"] img {
-            height: auto !important; 
-            width: 100% !important;
-            object-fit: contain !important; 
-            border-radius: 0px !important; 
-        }
-        </style>
-        """, unsafe_allow_html=True)
-    
-    # You can display images in columns or a single large view
-    pic_col1, pic_col2, pic_col3, pic_col4, pic_col5, pic_col6, pic_col7, pic_col8 = st.columns(8)
-    
-    with pic_col1:
-        st.image("1.jpeg", use_container_width=True)
-    
-    with pic_col2:
-        st.image("2.jpeg", use_container_width=True)
+    found, missing = [], []
+    for path in GALLERY_FILES:
+        try:
+            load_asset(path)
+            found.append(path)
+        except OSError:
+            missing.append(path)
+    if missing:
+        st.warning(f"Gallery images not found: {', '.join(missing)}. Run optimize_images.py to regenerate them.")
 
-    with pic_col3:
-        st.image("3.jpeg", use_container_width=True)
+    # All eight photos go out as one inline flex row instead of 8 columns + 8 image widgets
+    st.markdown(build_gallery_html(tuple(found)), unsafe_allow_html=True)
 
-    with pic_col4:
-        st.image("4.jpeg", use_container_width=True)
-    
-    with pic_col5:
-        st.image("5.jpeg", use_container_width=True)
+def main():
+# --- BACKGROUND IMAGE LOGIC ---
+    # Emitted on every rerun: Streamlit removes elements a rerun does not
+    # re-emit, so skipping it would unstyle the page after the first interaction.
+    try:
+        # This looks for your Background.jpeg file
+        page_css = build_page_css()
+    except OSError:
+        page_css = _STATIC_CSS
+        st.error("Background image not found. Ensure 'Background.jpeg' is in the folder.")
+    st.markdown(page_css, unsafe_allow_html=True)
 
-    with pic_col6:
-        st.image("6.jpeg", use_container_width=True)
+    # --- SIDEBAR: LOGO & INPUTS ---
+    try:
+        st.sidebar.image(load_asset("logo.webp"), use_container_width=True)
+    except OSError:
+        st.sidebar.title("☕ Candour Coffee")
+    
+    st.sidebar.markdown("---")
+    st.sidebar.header("🕹️ Live Operations Input")
+    st.sidebar.info("Update these values based on real-time floor data to bridge the 'Visibility Gap.")
+    
+    curr_stock = st.sidebar.number_input("Current Stock (kg)", value=45)
+    curr_cycle = st.sidebar.slider("Current Cycle Time (sec)", CYCLE_MIN, CYCLE_MAX, 29)
+    curr_defect = st.sidebar.slider("Defect Rate (%)", 0.0, 5.0, 1.2)
 
-    with pic_col7:
-        st.image("7.jpeg", use_container_width=True)
+    # --- HEADER ---
+    st.title("🚀 Operational Nervous System: Vikhroli Facility")
+    st.markdown(f"**Focus: Efficiency & Excellence*")
+    
+    # st.image("roastery.jpg", caption="Candour Coffee Roastery Operations", use_container_width=True)
+    
+    st.markdown("---")
 
-    with pic_col8:
-        st.image("8.jpeg", use_container_width=True)
+    inventory_section(curr_stock)
+    kpi_section(curr_cycle, curr_defect)
+    trend_section(curr_cycle)
+    capacity_section()
+    gallery_section()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
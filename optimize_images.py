@@ -0,0 +1,21 @@
+from PIL import Image
+
+# --- ONE-TIME ASSET PREPROCESSING ---
+# The gallery CSS renders every photo at 300px tall, so shipping the
+# full-resolution JPEGs is wasted bandwidth. Run this once after adding or
+# replacing a photo: it writes a downscaled WebP next to each source file.
+GALLERY_SIZE = (400, 300)  # Max (width, height) of a rendered gallery image
+QUALITY = 80
+
+def main():
+    for i in range(1, 9):
+        with Image.open(f"{i}.jpeg") as img:
+            img.thumbnail(GALLERY_SIZE)
+            img.save(f"{i}.webp", "webp", quality=QUALITY)
+
+    # Logo already fits the sidebar; re-encode losslessly to keep the edges crisp
+    with Image.open("logo.png") as img:
+        img.save("logo.webp", "webp", lossless=True)
+
+if __name__ == "__main__":
+    main()